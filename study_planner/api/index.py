@@ -1,5 +1,7 @@
 from flask import Flask, render_template, request, redirect, url_for, session, flash
 from study_planner.database.db import get_db_connection
+from study_planner.static_assets import init_static
+from study_planner.uploads import MAX_UPLOAD_SIZE, MAX_PDF_PAGES, open_syllabus
 from datetime import datetime
 import os
 
@@ -12,9 +14,15 @@ app = Flask(__name__,
             template_folder=os.path.join(base_dir, '..', 'study_planner', 'templates'), 
             static_folder=os.path.join(base_dir, '..', 'study_planner', 'static'))
 
+# Cap the whole form; Werkzeug already spools file parts over 500 KB to temp files
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_SIZE
+
 # Secret key is needed for session management
 app.secret_key = os.environ.get('SECRET_KEY', 'your_secret_key_here')
 
+# Fingerprinted, long-cached and precompressed static files
+init_static(app)
+
 @app.route('/')
 def home():
     return render_template('home.html')
@@ -208,6 +216,27 @@ def create_plan():
         try:
             from study_planner.ai_planner import get_agent
             planner = get_agent()
+
+            subjects = request.form.getlist('subjects[]')
+            manual_topics_list = request.form.getlist('topics[]')
+            difficulties = request.form.getlist('difficulties[]')
+            unit_starts = request.form.getlist('unit_starts[]')
+            unit_ends = request.form.getlist('unit_ends[]')
+            syllabus_files = request.files.getlist('syllabus_pdfs[]')
+
+            # Read every syllabus before anything is written, so a bad upload never leaves a half-created plan
+            extracted_by_subject = {}
+            for i in range(len(subjects)):
+                file = syllabus_files[i] if i < len(syllabus_files) else None
+                if not subjects[i].strip() or not file or file.filename == '': continue
+
+                u_start = unit_starts[i] if i < len(unit_starts) else None
+                u_end = unit_ends[i] if i < len(unit_ends) else None
+                with open_syllabus(file) as reader:
+                    if len(reader.pages) > MAX_PDF_PAGES:
+                        flash(f"'{file.filename}' has {len(reader.pages)} pages; only the first {MAX_PDF_PAGES} were read.", "warning")
+                    extracted_by_subject[i] = planner.extract_from_pdf(reader, u_start, u_end, max_pages=MAX_PDF_PAGES)
+
             supabase = get_db_connection(session.get('access_token'))
             
             plan_data = {
@@ -226,26 +255,13 @@ def create_plan():
             subjects_data = []
             subjects_info_for_ai = [] 
             
-            subjects = request.form.getlist('subjects[]')
-            manual_topics_list = request.form.getlist('topics[]')
-            difficulties = request.form.getlist('difficulties[]')
-            unit_starts = request.form.getlist('unit_starts[]')
-            unit_ends = request.form.getlist('unit_ends[]')
-            syllabus_files = request.files.getlist('syllabus_pdfs[]')
-            
             for i in range(len(subjects)):
                 if not subjects[i].strip(): continue
                 
                 sub_name = subjects[i].strip()
                 sub_diff = difficulties[i] if i < len(difficulties) else "2"
                 manual_top = manual_topics_list[i].strip() if i < len(manual_topics_list) else ""
-                file = syllabus_files[i] if i < len(syllabus_files) else None
-                
-                extracted_topics = []
-                if file and file.filename != '':
-                    u_start = unit_starts[i] if i < len(unit_starts) else None
-                    u_end = unit_ends[i] if i < len(unit_ends) else None
-                    extracted_topics = planner.extract_from_pdf(file, u_start, u_end)
+                extracted_topics = extracted_by_subject.get(i, [])
                     
                 main_topics_summary = manual_top
                 if extracted_topics:
@@ -258,12 +274,12 @@ def create_plan():
                     "topics": main_topics_summary
                 })
                 
-                for t in extracted_topics:
+                if extracted_topics:
+                    # Passed as a list so each topic keeps its own difficulty and matched reference
                     subjects_info_for_ai.append({
                         'name': sub_name,
-                        'topics': t['name'],
-                        'difficulty': t['difficulty'],
-                        'reference': t.get('reference')
+                        'topics': extracted_topics,
+                        'difficulty': sub_diff
                     })
                 
                 if manual_top:
@@ -316,6 +332,11 @@ def create_plan():
             
     return render_template('create_plan.html')
 
+@app.errorhandler(413)
+def upload_too_large(e):
+    flash(f"Upload is too large. The combined size of all syllabus PDFs must be under {MAX_UPLOAD_SIZE // (1024 * 1024)} MB.", "error")
+    return redirect(url_for('create_plan'))
+
 @app.route('/view_plan/<plan_id>')
 def view_plan(plan_id):
     if 'user' not in session:
@@ -367,5 +388,12 @@ def toggle_task(task_id):
     except Exception as e:
         return {"error": str(e)}, 500
 
+@app.route('/cache_stats')
+def cache_stats():
+    if 'user' not in session:
+        return {"error": "Unauthorized"}, 401
+    from study_planner.ai_planner import get_agent
+    return get_agent().plan_cache.stats()
+
 if __name__ == '__main__':
     app.run(debug=True)
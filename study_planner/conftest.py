@@ -0,0 +1,37 @@
+import io
+import pytest
+
+# Manual script that talks to a live Supabase project; run it directly instead
+collect_ignore = ['test_profile_update.py']
+
+def build_pdf(pages):
+    """Builds a minimal PDF in memory; each entry of pages is the list of text lines on that page"""
+    font_num = 3 + 2 * len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (' '.join(f"{3 + 2 * n} 0 R" for n in range(len(pages))), len(pages))).encode(),
+    ]
+    for n, lines in enumerate(pages):
+        text_ops = ["BT", "/F1 12 Tf", "14 TL", "50 750 Td"] + [f"({line}) Tj T*" for line in lines] + ["ET"]
+        content = "\n".join(text_ops).encode('latin-1')
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * n} 0 R /Resources << /Font << /F1 {font_num} 0 R >> >> >>".encode())
+        objects.append(b"<< /Length " + str(len(content)).encode() + b" >>\nstream\n" + content + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for num, obj in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{num} 0 obj\n".encode() + obj + b"\nendobj\n")
+    xref_pos = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_pos}\n%%EOF\n".encode())
+    out.seek(0)
+    return out
+
+@pytest.fixture
+def make_pdf():
+    return build_pdf
@@ -0,0 +1,42 @@
+import os
+
+# Production serving profile for gunicorn (picked up automatically from the working directory)
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+
+# Requests mostly wait on Supabase, so a few processes with several threads each
+# handle more concurrent users than one sync worker per core
+worker_class = 'gthread'
+
+def available_cpus():
+    """CPUs this container may actually use: its CPU affinity, further limited by a cgroup v2 quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+# Capped so a large host doesn't fork dozens of preloaded processes; WEB_CONCURRENCY overrides it
+workers = int(os.environ.get('WEB_CONCURRENCY', min(available_cpus() + 1, 8)))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Load the app once in the master and fork it, instead of importing it in every worker
+preload_app = True
+
+# Syllabus PDFs are uploaded and parsed inside the request
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically to keep memory from creeping up
+max_requests = 1000
+max_requests_jitter = 100
+
+accesslog = '-'
+errorlog = '-'
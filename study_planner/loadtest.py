@@ -0,0 +1,219 @@
+"""
+Simple load test for comparing two running deployments of the app.
+
+Example: start the old setup on port 8000 and the tuned profile on port 8080, then run
+    python loadtest.py http://localhost:8000 http://localhost:8080 --requests 500 --concurrency 20
+
+Without credentials only public pages and static files are requested. Static URLs are taken
+from the rendered pages (so they carry the ?v= fingerprint when the server adds one) and go
+through a small browser-style cache shared by all threads: files still fresh under their
+Cache-Control max-age are not requested again, and stale ones are revalidated with If-None-Match.
+This measures static caching and compression, not the Supabase-bound or upload routes.
+Pass --email/--password of a test account to add /dashboard, and --pdf to also submit
+/create_plan with that syllabus (this creates real plans for the account).
+"""
+import argparse
+import html
+import http.cookiejar
+import os
+import re
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+PAGE_PATHS = ['/', '/login']
+FALLBACK_STATIC = ['/static/css/style.css', '/static/js/script.js']
+STATIC_LINK = re.compile(r'(?:href|src)="(/static/[^"]+)"')
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Counts a redirect as the response, so a POST is timed on its own"""
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+def make_opener(base_url, email=None, password=None):
+    """Opener that shares one session cookie; logs in first if credentials are given"""
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar), NoRedirect())
+    if email:
+        data = urllib.parse.urlencode({'email': email, 'password': password}).encode()
+        try:
+            # A failed login re-renders the form; only a redirect means success
+            opener.open(base_url + '/login', data=data, timeout=30)
+            raise SystemExit(f"Login failed against {base_url}")
+        except urllib.error.HTTPError as e:
+            if e.code != 302:
+                raise
+    return opener
+
+def create_plan_body(pdf_path):
+    """Multipart form for /create_plan with a single subject and syllabus"""
+    boundary = uuid.uuid4().hex
+    fields = {
+        'title': 'Load test plan', 'goal': 'Load test', 'start_date': '2026-01-01', 'end_date': '2026-01-31',
+        'subjects[]': 'Load Test', 'topics[]': '', 'difficulties[]': '2', 'unit_starts[]': '', 'unit_ends[]': ''
+    }
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    with open(pdf_path, 'rb') as f:
+        pdf = f.read()
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="syllabus_pdfs[]"; filename="{os.path.basename(pdf_path)}"\r\n'
+        f'Content-Type: application/pdf\r\n\r\n'.encode() + pdf + b'\r\n'
+    )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+def discover_static(opener, base_url):
+    """Static URLs exactly as the pages link them, including any ?v= fingerprint"""
+    links = set()
+    for path in PAGE_PATHS:
+        try:
+            with opener.open(base_url + path, timeout=30) as res:
+                page = res.read().decode('utf-8', 'replace')
+        except (urllib.error.URLError, OSError):
+            continue
+        links.update(html.unescape(link) for link in STATIC_LINK.findall(page))
+    return sorted(links) or FALLBACK_STATIC
+
+class ClientCache:
+    """Browser-style cache for static files: honours max-age and revalidates with the ETag"""
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def lookup(self, url):
+        """Returns (fresh, etag) for a URL"""
+        with self.lock:
+            entry = self.entries.get(url)
+        if not entry:
+            return False, None
+        expires, etag = entry
+        return time.monotonic() < expires, etag
+
+    def store(self, url, headers):
+        cache_control = headers.get('Cache-Control', '')
+        match = re.search(r'max-age=(\d+)', cache_control)
+        max_age = int(match.group(1)) if match and 'no-cache' not in cache_control else 0
+        with self.lock:
+            etag = headers.get('ETag') or (self.entries.get(url) or (0, None))[1]
+            self.entries[url] = (time.monotonic() + max_age, etag)
+
+def succeeded(kind, status, headers):
+    """Whether a response is what a working deployment returns for this kind of request"""
+    if kind == 'create':
+        # create_plan redirects to the dashboard on success, and back to itself with an error flash on failure
+        return status == 302 and urllib.parse.urlparse(headers.get('Location', '')).path == '/dashboard'
+    if kind == 'static':
+        return status in (200, 304)
+    # Pages, /dashboard included, must render; a redirect to /login means the session was not accepted
+    return status == 200
+
+def fetch(opener, kind, req, cache):
+    """Returns (seconds, bytes, ok, from_cache) for one request"""
+    if kind == 'static':
+        fresh, etag = cache.lookup(req.full_url)
+        if fresh:
+            return 0.0, 0, True, True
+        if etag:
+            req.add_header('If-None-Match', etag)
+
+    start = time.perf_counter()
+    try:
+        with opener.open(req, timeout=120) as res:
+            size = len(res.read())
+            status, headers = res.status, res.headers
+    except urllib.error.HTTPError as e:
+        # Redirects and 304s arrive here because NoRedirect stops urllib from following them
+        size, status, headers = 0, e.code, e.headers
+    except (urllib.error.URLError, OSError):
+        return time.perf_counter() - start, 0, False, False
+    elapsed = time.perf_counter() - start
+
+    if kind == 'static' and status in (200, 304):
+        cache.store(req.full_url, headers)
+    return elapsed, size, succeeded(kind, status, headers), False
+
+def build_requests(base_url, total, static_paths, authenticated, plan_body):
+    targets = [('page', p) for p in PAGE_PATHS] + [('static', p) for p in static_paths]
+    if authenticated:
+        targets.append(('page', '/dashboard'))
+    if plan_body:
+        targets.append(('create', '/create_plan'))
+
+    reqs = []
+    for i in range(total):
+        kind, path = targets[i % len(targets)]
+        headers = {'Accept-Encoding': 'br, gzip'}
+        data = None
+        if kind == 'create':
+            data, headers['Content-Type'] = plan_body
+        reqs.append((kind, path, urllib.request.Request(base_url + path, data=data, headers=headers)))
+    return reqs
+
+def summarize(results):
+    network = sorted(r[0] * 1000 for r in results if not r[3]) or [0.0]
+    return {
+        'requests': len(results),
+        'errors': sum(1 for r in results if not r[2]),
+        'from_cache': sum(1 for r in results if r[3]),
+        'p50_ms': round(statistics.median(network), 1),
+        'p95_ms': round(network[max(0, int(len(network) * 0.95) - 1)], 1),
+        'kb_transferred': round(sum(r[1] for r in results) / 1024, 1)
+    }
+
+def run(base_url, total, concurrency, email, password, plan_body):
+    base_url = base_url.rstrip('/')
+    opener = make_opener(base_url, email, password)
+    static_paths = discover_static(opener, base_url)
+    reqs = build_requests(base_url, total, static_paths, bool(email), plan_body)
+    cache = ClientCache()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda r: fetch(opener, r[0], r[2], cache), reqs))
+    elapsed = time.perf_counter() - start
+
+    summary = {'all': summarize(results)}
+    summary['all']['req_per_sec'] = round(total / elapsed, 1)
+    groups = {'static': lambda kind, path: kind == 'static'}
+    for route in ('/dashboard', '/create_plan'):
+        groups[route] = lambda kind, path, route=route: path == route
+    for name, matches in groups.items():
+        subset = [res for (kind, path, _), res in zip(reqs, results) if matches(kind, path)]
+        if subset:
+            summary[name] = summarize(subset)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare throughput and latency of two app deployments.")
+    parser.add_argument('baseline', help="URL of the current setup, e.g. http://localhost:8000")
+    parser.add_argument('candidate', help="URL of the tuned setup, e.g. http://localhost:8080")
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--email', help="Test account used for the authenticated routes")
+    parser.add_argument('--password')
+    parser.add_argument('--pdf', help="Syllabus PDF to submit to /create_plan (requires --email)")
+    args = parser.parse_args()
+
+    if args.pdf and not args.email:
+        parser.error("--pdf requires --email and --password")
+    plan_body = create_plan_body(args.pdf) if args.pdf else None
+
+    results = {}
+    for label, url in (('baseline', args.baseline), ('candidate', args.candidate)):
+        results[label] = run(url, args.requests, args.concurrency, args.email, args.password, plan_body)
+
+    for scenario in results['baseline']:
+        print(f"\n[{scenario}]")
+        print(f"{'metric':<16}{'baseline':>12}{'candidate':>12}")
+        for metric in results['baseline'][scenario]:
+            print(f"{metric:<16}{results['baseline'][scenario][metric]:>12}{results['candidate'][scenario].get(metric, '-'):>12}")
+
+if __name__ == '__main__':
+    main()
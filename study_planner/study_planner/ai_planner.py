@@ -1,13 +1,198 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-import random
+import hashlib
+import json
+import os
 import re
+import tempfile
+import threading
 from pypdf import PdfReader
 
+class ReferenceMatcher:
+    """
+    Token index over the reference lines of a single syllabus, built once per document.
+    Topics are matched to references deterministically so the same PDF always yields the same plan.
+    """
+    stopwords = {'and', 'the', 'for', 'with', 'from', 'into', 'its', 'their', 'edition', 'press', 'publication', 'publications', 'publisher', 'introduction', 'unit'}
+
+    def __init__(self, references):
+        self.references = references
+        self.index = {}
+        for idx, ref in enumerate(references):
+            for token in self.tokenize(ref):
+                self.index.setdefault(token, set()).add(idx)
+
+    def tokenize(self, text):
+        """Lowercased word tokens, ignoring short words and bibliographic filler"""
+        return {w for w in re.findall(r'[a-z0-9]+', text.lower()) if len(w) > 2 and w not in self.stopwords}
+
+    def match(self, topic, unit_num=None):
+        """
+        Returns the reference sharing the most tokens with the topic.
+        Ties (and topics with no overlap) go to the reference closest to the unit's position in the list.
+        """
+        if not self.references: return None
+
+        # Units past the end of the list stay on the last reference rather than wrapping around
+        slot = min(unit_num, len(self.references)) - 1 if unit_num else 0
+        scores = {}
+        for token in self.tokenize(topic):
+            for idx in self.index.get(token, ()):
+                scores[idx] = scores.get(idx, 0) + 1
+
+        if not scores: return self.references[slot]
+        best = max(scores, key=lambda idx: (scores[idx], -abs(idx - slot), -idx))
+        return self.references[best]
+
+# Bump whenever _build_schedule changes what it returns, so cached schedules from older code are not reused
+SCHEDULE_VERSION = 1
+
+class PlanCache:
+    """
+    Bounded LRU cache of generated schedules, keyed on a hash of the normalized plan inputs.
+    If a directory is given, entries are also written there as JSON and survive restarts.
+    The directory is pruned in batches, so it may briefly hold up to prune_every extra files.
+    """
+    def __init__(self, max_entries=256, cache_dir=None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Listing and stat-ing the whole directory costs more than building a schedule, so don't do it on every write
+        self.prune_every = max(1, max_entries // 8)
+        self.writes_since_prune = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._prune()
+
+    def make_key(self, subjects_info, start_date_str, end_date_str, salt=''):
+        """
+        Canonical hash of the fields generate_plan actually reads, including each topic's reference.
+        The salt identifies the scheduling logic that produced the entry.
+        """
+        subjects = []
+        for sub in subjects_info:
+            raw_topics = sub.get('topics', '')
+            if isinstance(raw_topics, list):
+                topics = [[t['name'], t.get('difficulty'), t.get('reference')] for t in raw_topics]
+            else:
+                topics = [t.strip() for t in raw_topics.split(',') if t.strip()]
+            subjects.append([sub['name'], sub.get('difficulty', '2'), topics])
+
+        payload = json.dumps([salt, subjects, start_date_str[:10], end_date_str[:10]], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return [dict(task) for task in self.entries[key]]
+
+        schedule = self._load(key)
+        with self.lock:
+            if schedule is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, schedule)
+        return [dict(task) for task in schedule]
+
+    def put(self, key, schedule):
+        schedule = [dict(task) for task in schedule]
+        with self.lock:
+            self._store(key, schedule)
+        self._save(key, schedule)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self.entries),
+                'max_entries': self.max_entries,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'persistent': bool(self.cache_dir)
+            }
+
+    def _store(self, key, schedule):
+        """Inserts into the in-memory LRU; caller holds the lock"""
+        self.entries[key] = schedule
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, key):
+        if not self.cache_dir: return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                schedule = json.load(f)
+            # Mark as recently used so _prune keeps it
+            os.utime(path)
+            return schedule
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key, schedule):
+        if not self.cache_dir: return
+        try:
+            # Write to a temp file first so concurrent workers never read a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(schedule, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"Plan cache write error: {e}")
+            return
+
+        with self.lock:
+            self.writes_since_prune += 1
+            due = self.writes_since_prune >= self.prune_every
+            if due: self.writes_since_prune = 0
+        if due:
+            self._prune()
+
+    def _prune(self):
+        """Keeps at most max_entries files on disk, dropping the least recently used"""
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError as e:
+            print(f"Plan cache prune error: {e}")
+            return
+
+        entries = []
+        for name in names:
+            if not name.endswith('.json'): continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                # Another worker may have removed it already
+                pass
+
 class StudyAgent:
     """
     An advanced Study Agent with robust PDF Syllabus parsing and ML-based difficulty prediction.
     """
-    def __init__(self):
+    def __init__(self, plan_cache=None):
+        self.plan_cache = plan_cache or PlanCache()
         self.difficulty_map = {
             '1': {'label': 'Easy', 'weight': 1, 'days': 1},
             '2': {'label': 'Medium', 'weight': 2, 'days': 2},
@@ -64,14 +249,18 @@ class StudyAgent:
                 return True
         return False
 
-    def extract_from_pdf(self, pdf_file, unit_start=None, unit_end=None):
+    def extract_from_pdf(self, pdf_file, unit_start=None, unit_end=None, max_pages=None):
         """
         Refined PDF parser that extracts meaningful Syllabus content and References.
+        Accepts a file or an already opened PdfReader; only the first max_pages pages are read.
         """
-        reader = PdfReader(pdf_file)
+        reader = pdf_file if isinstance(pdf_file, PdfReader) else PdfReader(pdf_file)
+        page_count = len(reader.pages)
+        if max_pages: page_count = min(page_count, max_pages)
+
         full_text = ""
-        for page in reader.pages:
-            full_text += page.extract_text() + "\n"
+        for index in range(page_count):
+            full_text += reader.pages[index].extract_text() + "\n"
 
         # 1. Identify Reference section
         references = []
@@ -83,6 +272,7 @@ class StudyAgent:
                 clean_ref = line.strip()
                 if len(clean_ref) > 15 and not self.is_noise(clean_ref):
                     references.append(clean_ref)
+        matcher = ReferenceMatcher(references)
         
         # 2. Extract Syllabus Units
         # Split by Unit/Module/Chapter markers
@@ -121,7 +311,7 @@ class StudyAgent:
                     extracted_topics.append({
                         'name': f"{unit_label}: {topic}",
                         'difficulty': self.predict_difficulty(topic),
-                        'reference': random.choice(references) if references else None
+                        'reference': matcher.match(topic, num)
                     })
             
             i += 3
@@ -136,7 +326,7 @@ class StudyAgent:
                         extracted_topics.append({
                             'name': topic,
                             'difficulty': self.predict_difficulty(topic),
-                            'reference': random.choice(references) if references else None
+                            'reference': matcher.match(topic)
                         })
 
         return extracted_topics[:35]
@@ -148,7 +338,28 @@ class StudyAgent:
         romans = {'I':1, 'II':2, 'III':3, 'IV':4, 'V':5, 'VI':6, 'VII':7, 'VIII':8, 'IX':9, 'X':10}
         return romans.get(s, 0)
 
+    def _reference_link(self, subject, topic, reference):
+        """Builds the (url, label) pair shown next to a task"""
+        if reference:
+            ref_query = reference.replace(' ', '+')
+            return f"https://www.google.com/search?q={ref_query}+free+pdf+book", f"Ref: {reference}"
+        topic_clean = topic.replace(':', '').strip()
+        query = f"{subject}+{topic_clean}".replace(' ', '+')
+        return f"https://www.google.com/search?q={query}+tutorial+free+course", "Search free courses & materials"
+
     def generate_plan(self, subjects_info, start_date_str, end_date_str):
+        """
+        Returns the schedule for the given inputs, reusing a cached one when the same plan was generated before.
+        """
+        salt = f"{SCHEDULE_VERSION}:{json.dumps(self.difficulty_map, sort_keys=True)}"
+        key = self.plan_cache.make_key(subjects_info, start_date_str, end_date_str, salt)
+        schedule = self.plan_cache.get(key)
+        if schedule is None:
+            schedule = self._build_schedule(subjects_info, start_date_str, end_date_str)
+            self.plan_cache.put(key, schedule)
+        return schedule
+
+    def _build_schedule(self, subjects_info, start_date_str, end_date_str):
         """
         AI-driven logic with balanced subject interleaving and manageable daily tasks.
         """
@@ -184,13 +395,16 @@ class StudyAgent:
                 diff = t_item.get('difficulty', sub.get('difficulty', '2'))
                 ref = t_item.get('reference') 
                 config = self.difficulty_map.get(diff, self.difficulty_map['2'])
+                # Built once per topic and shared by all of its parts
+                ref_link, ref_label = self._reference_link(sub_name, name, ref)
                 
                 for i in range(config['days']):
                     subject_queues[sub_name].append({
                         'subject': sub_name,
                         'topic': name,
                         'difficulty': diff,
-                        'reference': ref,
+                        'reference_url': ref_link,
+                        'reference_text': ref_label,
                         'day_num': i + 1,
                         'total_days': config['days']
                     })
@@ -228,24 +442,13 @@ class StudyAgent:
                     task_desc = item['topic']
                     if item['total_days'] > 1:
                         task_desc += f" (Part {item['day_num']}/{item['total_days']})"
-                    
-                    # Generate reference link
-                    topic_clean = item['topic'].replace(':', '').strip()
-                    if item['reference']:
-                        ref_query = item['reference'].replace(' ', '+')
-                        ref_link = f"https://www.google.com/search?q={ref_query}+free+pdf+book"
-                        ref_label = f"Ref: {item['reference']}"
-                    else:
-                        query = f"{item['subject']}+{topic_clean}".replace(' ', '+')
-                        ref_link = f"https://www.google.com/search?q={query}+tutorial+free+course"
-                        ref_label = "Search free courses & materials"
 
                     schedule.append({
                         "date": current_date.strftime('%Y-%m-%d'),
                         "subject": item['subject'],
                         "description": f"[{diff_label}] {task_desc}",
-                        "reference_url": ref_link,
-                        "reference_text": ref_label,
+                        "reference_url": item['reference_url'],
+                        "reference_text": item['reference_text'],
                         "difficulty": item['difficulty']
                     })
                     tasks_added_today += 1
@@ -257,5 +460,18 @@ class StudyAgent:
 
         return schedule
 
+_agent = None
+_agent_lock = threading.Lock()
+
 def get_agent():
-    return StudyAgent()
+    """Returns the process-wide StudyAgent, creating it on first use"""
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                cache = PlanCache(
+                    max_entries=int(os.environ.get('PLAN_CACHE_SIZE', 256)),
+                    cache_dir=os.environ.get('PLAN_CACHE_DIR') or None
+                )
+                _agent = StudyAgent(plan_cache=cache)
+    return _agent
@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from flask import request, send_from_directory
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Fingerprinted URLs change whenever the file does, so browsers may keep them for a year
+LONG_CACHE = 'public, max-age=31536000, immutable'
+SHORT_CACHE = 'public, max-age=300'
+COMPRESSIBLE = ('.css', '.js', '.svg', '.html', '.json', '.txt')
+
+def file_hash(path):
+    """Short content hash used as the fingerprint of a static file"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+def init_static(app):
+    """
+    Serves static files with content fingerprints, far-future caching
+    and precompressed .br/.gz variants when the client accepts them.
+    """
+    static_folder = app.static_folder
+    hashes = {}
+
+    def fingerprint(filename):
+        """Content hash of a static file, recomputed whenever the file changes on disk"""
+        path = os.path.join(static_folder, filename)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        cached = hashes.get(filename)
+        if not cached or cached[0] != mtime:
+            cached = (mtime, file_hash(path))
+            hashes[filename] = cached
+        return cached[1]
+
+    def compressed_variant(filename):
+        """Best precompressed file the client accepts, skipping variants older than the source"""
+        path = os.path.join(static_folder, filename)
+        for enc, ext in (('br', '.br'), ('gzip', '.gz')):
+            if request.accept_encodings[enc] <= 0:
+                continue
+            try:
+                if os.path.getmtime(path + ext) >= os.path.getmtime(path):
+                    return filename + ext, enc
+            except OSError:
+                pass
+        return filename, None
+
+    @app.url_defaults
+    def add_fingerprint(endpoint, values):
+        if endpoint == 'static' and 'filename' in values:
+            version = fingerprint(values['filename'])
+            if version:
+                values['v'] = version
+
+    def serve_static(filename):
+        served_name, encoding = filename, None
+        if filename.endswith(COMPRESSIBLE):
+            served_name, encoding = compressed_variant(filename)
+
+        mimetype = mimetypes.guess_type(filename)[0]
+        response = send_from_directory(static_folder, served_name, mimetype=mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if filename.endswith(COMPRESSIBLE):
+            response.headers['Vary'] = 'Accept-Encoding'
+
+        if request.args.get('v') and request.args.get('v') == fingerprint(filename):
+            response.headers['Cache-Control'] = LONG_CACHE
+        else:
+            response.headers['Cache-Control'] = SHORT_CACHE
+        return response
+
+    app.view_functions['static'] = serve_static
+
+def precompress(static_folder):
+    """Writes .gz (and .br, if brotli is installed) next to every compressible static file"""
+    for root, _, files in os.walk(static_folder):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+
+            with open(path + '.gz', 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=9))
+            if brotli:
+                with open(path + '.br', 'wb') as f:
+                    f.write(brotli.compress(data, quality=11))
+            print(f"Compressed {os.path.relpath(path, static_folder)}")
+
+if __name__ == '__main__':
+    precompress(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
@@ -0,0 +1,68 @@
+import mmap
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
+
+MB = 1024 * 1024
+
+# Limits can be tuned per deployment; sizes are in megabytes
+MAX_UPLOAD_SIZE = int(float(os.environ.get('MAX_UPLOAD_MB', 25)) * MB)
+MAX_PDF_SIZE = int(float(os.environ.get('MAX_PDF_MB', 10)) * MB)
+MAX_PDF_PAGES = int(os.environ.get('MAX_PDF_PAGES', 50))
+
+class UploadError(Exception):
+    """Raised when an uploaded syllabus cannot be accepted"""
+
+def file_size(file):
+    """Size of an uploaded file in bytes, measured without reading it"""
+    stream = file.stream
+    pos = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(pos)
+    return size
+
+@contextmanager
+def open_syllabus(file):
+    """
+    Checks the size of an uploaded syllabus and yields a PdfReader over a memory-mapped copy of it.
+    Werkzeug spools uploads over 500 KB to a temp file; calling fileno() moves smaller ones there too,
+    so the PDF is always read through the page cache rather than held in worker memory.
+    Only the page tree is parsed here; text is extracted by the caller inside the with-block.
+    """
+    if file_size(file) > MAX_PDF_SIZE:
+        raise UploadError(f"'{file.filename}' is larger than {MAX_PDF_SIZE // MB} MB. Please upload a smaller syllabus.")
+
+    stream = file.stream
+    stream.seek(0)
+    tmp = None
+    try:
+        fileno = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        # Stream is not backed by a real file; spool it to disk so it can be mapped
+        tmp = tempfile.TemporaryFile()
+        shutil.copyfileobj(stream, tmp)
+        tmp.flush()
+        fileno = tmp.fileno()
+
+    mapped = None
+    try:
+        if os.fstat(fileno).st_size == 0:
+            raise UploadError(f"'{file.filename}' is empty.")
+        mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        try:
+            reader = PdfReader(mapped)
+            page_count = len(reader.pages)
+        except (PdfReadError, ValueError) as e:
+            raise UploadError(f"'{file.filename}' is not a readable PDF: {e}")
+        if page_count == 0:
+            raise UploadError(f"'{file.filename}' has no pages.")
+        yield reader
+    finally:
+        if mapped is not None:
+            mapped.close()
+        if tmp is not None:
+            tmp.close()
@@ -0,0 +1,98 @@
+import os
+import time
+from study_planner.ai_planner import PlanCache, StudyAgent
+
+SUBJECTS = [{'name': 'OS', 'topics': 'threads, deadlock', 'difficulty': '2'}]
+
+def test_lru_keeps_recently_used_entries():
+    cache = PlanCache(max_entries=2)
+    cache.put('a', [{'n': 1}])
+    cache.put('b', [{'n': 2}])
+    assert cache.get('a') == [{'n': 1}]
+
+    cache.put('c', [{'n': 3}])
+
+    assert cache.get('b') is None
+    assert cache.get('a') == [{'n': 1}]
+    assert cache.get('c') == [{'n': 3}]
+    assert list(cache.entries) == ['a', 'c']
+
+def test_stats_count_hits_misses_and_evictions():
+    cache = PlanCache(max_entries=1)
+    cache.get('x')
+    cache.put('x', [])
+    cache.get('x')
+    cache.put('y', [])
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['evictions'] == 1
+    assert stats['size'] == 1
+    assert stats['hit_rate'] == 0.5
+    assert stats['persistent'] is False
+
+def test_get_and_put_return_copies():
+    cache = PlanCache()
+    schedule = [{'description': 'original'}]
+    cache.put('k', schedule)
+    schedule[0]['description'] = 'changed by caller'
+
+    first = cache.get('k')
+    first[0]['description'] = 'changed again'
+
+    assert cache.get('k') == [{'description': 'original'}]
+
+def test_key_is_normalized_and_salted():
+    cache = PlanCache()
+    key = cache.make_key(SUBJECTS, '2026-01-01', '2026-01-10', 'v1')
+
+    spaced = [{'name': 'OS', 'topics': ' threads ,deadlock, ', 'difficulty': '2'}]
+    assert cache.make_key(spaced, '2026-01-01T00:00', '2026-01-10', 'v1') == key
+    assert cache.make_key(SUBJECTS, '2026-01-01', '2026-01-10', 'v2') != key
+    assert cache.make_key(SUBJECTS, '2026-01-01', '2026-01-11', 'v1') != key
+
+    with_ref = [{'name': 'OS', 'topics': [{'name': 't', 'difficulty': '2', 'reference': 'Book A'}]}]
+    other_ref = [{'name': 'OS', 'topics': [{'name': 't', 'difficulty': '2', 'reference': 'Book B'}]}]
+    assert cache.make_key(with_ref, '2026-01-01', '2026-01-10') != cache.make_key(other_ref, '2026-01-01', '2026-01-10')
+
+def test_disk_entries_survive_a_new_cache(tmp_path):
+    first = PlanCache(cache_dir=str(tmp_path))
+    first.put('k', [{'date': '2026-01-01'}])
+
+    second = PlanCache(cache_dir=str(tmp_path))
+    assert second.get('k') == [{'date': '2026-01-01'}]
+    assert second.stats()['hits'] == 1
+
+def test_disk_prune_drops_least_recently_used_files(tmp_path):
+    writer = PlanCache(max_entries=100, cache_dir=str(tmp_path))
+    for n in range(12):
+        writer.put(f'k{n}', [])
+        # Distinct mtimes so the LRU order on disk is unambiguous
+        os.utime(tmp_path / f'k{n}.json', (time.time(), time.time() + n))
+
+    # A cache with a smaller limit prunes the directory when it starts
+    PlanCache(max_entries=8, cache_dir=str(tmp_path))
+    files = os.listdir(tmp_path)
+    assert len(files) == 8
+    assert 'k3.json' not in files
+    assert 'k4.json' in files
+
+def test_disk_prune_runs_in_batches(tmp_path):
+    cache = PlanCache(max_entries=16, cache_dir=str(tmp_path))
+    assert cache.prune_every == 2
+    for n in range(17):
+        cache.put(f'k{n}', [])
+    # The 17th file is written but not pruned until the next batch
+    assert len(os.listdir(tmp_path)) == 17
+    cache.put('k17', [])
+    assert len(os.listdir(tmp_path)) == 16
+
+def test_generate_plan_reuses_cached_schedule():
+    agent = StudyAgent(plan_cache=PlanCache())
+    first = agent.generate_plan(SUBJECTS, '2026-01-01', '2026-01-10')
+    second = agent.generate_plan(SUBJECTS, '2026-01-01', '2026-01-10')
+
+    assert first == second
+    assert agent.plan_cache.stats()['hits'] == 1
+    assert agent.plan_cache.stats()['misses'] == 1
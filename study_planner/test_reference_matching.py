@@ -0,0 +1,40 @@
+from study_planner.ai_planner import StudyAgent, PlanCache, ReferenceMatcher
+
+SYLLABUS_LINES = [
+    "Unit 1",
+    "Process scheduling and threads in operating systems",
+    "Unit 2",
+    "Compiler design and lexical analysis phases",
+    "Reference Books",
+    "Operating System Concepts by Silberschatz",
+    "Compilers Principles and Design by Aho",
+]
+
+def plan_for_pdf(make_pdf):
+    """Runs a fresh agent over the syllabus the same way create_plan does"""
+    agent = StudyAgent(plan_cache=PlanCache())
+    topics = agent.extract_from_pdf(make_pdf([SYLLABUS_LINES]))
+    subjects_info = [{'name': 'CS', 'topics': topics, 'difficulty': '2'}]
+    return agent.generate_plan(subjects_info, '2026-01-01', '2026-01-10')
+
+def test_same_pdf_gives_same_reference_links(make_pdf):
+    first = plan_for_pdf(make_pdf)
+    second = plan_for_pdf(make_pdf)
+
+    assert first
+    assert [t['reference_url'] for t in first] == [t['reference_url'] for t in second]
+    assert all(t['reference_text'].startswith("Ref: ") for t in first)
+
+    by_topic = {t['description']: t['reference_text'] for t in first}
+    assert any("Silberschatz" in ref for desc, ref in by_topic.items() if "scheduling" in desc)
+    assert any("Aho" in ref for desc, ref in by_topic.items() if "Compiler" in desc)
+
+def test_unmatched_topic_uses_nearest_unit_reference():
+    references = [f"Reference Book Volume {n}" for n in 'ABCDE']
+    matcher = ReferenceMatcher(references)
+
+    assert matcher.match("zzz", 2) == references[1]
+    # Units past the end of the list clamp to the last reference instead of wrapping to the first
+    assert matcher.match("zzz", 6) == references[4]
+    assert matcher.match("zzz", 40) == references[4]
+    assert matcher.match("zzz") == references[0]
@@ -0,0 +1,78 @@
+import gzip
+import os
+import pytest
+from flask import Flask, url_for
+from study_planner.static_assets import init_static, precompress, LONG_CACHE, SHORT_CACHE
+
+CSS = b"body { color: red; }\n" * 50
+
+@pytest.fixture
+def static_app(tmp_path):
+    css_dir = tmp_path / 'css'
+    css_dir.mkdir()
+    (css_dir / 'style.css').write_bytes(CSS)
+    precompress(str(tmp_path))
+    # Stand-in for a brotli variant; only the headers are checked
+    (css_dir / 'style.css.br').write_bytes(b'br-bytes')
+
+    app = Flask(__name__, static_folder=str(tmp_path))
+    init_static(app)
+    return app, tmp_path
+
+def static_url(app):
+    with app.test_request_context():
+        return url_for('static', filename='css/style.css')
+
+def test_url_carries_fingerprint_and_gets_long_cache(static_app):
+    app, _ = static_app
+    url = static_url(app)
+    assert '?v=' in url
+
+    res = app.test_client().get(url)
+    assert res.headers['Cache-Control'] == LONG_CACHE
+    assert res.headers['Vary'] == 'Accept-Encoding'
+
+def test_unversioned_or_wrong_version_gets_short_cache(static_app):
+    app, _ = static_app
+    client = app.test_client()
+    path = static_url(app).split('?')[0]
+    assert client.get(path).headers['Cache-Control'] == SHORT_CACHE
+    assert client.get(path + '?v=deadbeef').headers['Cache-Control'] == SHORT_CACHE
+
+def test_encoding_follows_accept_encoding_q_values(static_app):
+    app, _ = static_app
+    client = app.test_client()
+    url = static_url(app)
+
+    res = client.get(url, headers={'Accept-Encoding': 'br, gzip'})
+    assert res.headers['Content-Encoding'] == 'br'
+
+    res = client.get(url, headers={'Accept-Encoding': 'br;q=0, gzip'})
+    assert res.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(res.data) == CSS
+
+    res = client.get(url, headers={'Accept-Encoding': 'br;q=0, gzip;q=0'})
+    assert 'Content-Encoding' not in res.headers
+    assert res.data == CSS
+    assert res.headers['Content-Type'].startswith('text/css')
+
+def test_stale_variants_are_skipped_and_fingerprint_changes(static_app):
+    app, folder = static_app
+    old_url = static_url(app)
+    source = folder / 'css' / 'style.css'
+    source.write_bytes(b"body { color: blue; }\n")
+    # Make the edit strictly newer than the precompressed files
+    stat = os.stat(source)
+    os.utime(source, (stat.st_atime, stat.st_mtime + 10))
+
+    new_url = static_url(app)
+    assert new_url != old_url
+
+    client = app.test_client()
+    res = client.get(new_url, headers={'Accept-Encoding': 'br, gzip'})
+    assert 'Content-Encoding' not in res.headers
+    assert res.data == b"body { color: blue; }\n"
+    assert res.headers['Cache-Control'] == LONG_CACHE
+
+    # The old fingerprint no longer matches the file, so it must not be marked immutable
+    assert client.get(old_url).headers['Cache-Control'] == SHORT_CACHE
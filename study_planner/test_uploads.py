@@ -0,0 +1,112 @@
+import io
+import tempfile
+import pytest
+from werkzeug.datastructures import FileStorage
+import api.index as index
+from study_planner import uploads
+from study_planner.ai_planner import StudyAgent, PlanCache
+from study_planner.uploads import UploadError, open_syllabus
+
+PAGES = [
+    ["Unit 1", "Process scheduling and threads in operating systems"],
+    ["Unit 2", "Memory management and virtual paging schemes"],
+    ["Unit 3", "File systems and storage device management"],
+]
+
+class FakeTable:
+    def __init__(self, db, name):
+        self.db, self.name = db, name
+
+    def insert(self, data):
+        self.db.inserts.append((self.name, data))
+        self.data = data
+        return self
+
+    def execute(self):
+        rows = self.data if isinstance(self.data, list) else [self.data]
+        return type('Result', (), {'data': [dict(row, id=f"{self.name}-{n}") for n, row in enumerate(rows)]})()
+
+class FakeSupabase:
+    def __init__(self):
+        self.inserts = []
+
+    def table(self, name):
+        return FakeTable(self, name)
+
+@pytest.fixture
+def client(monkeypatch):
+    db = FakeSupabase()
+    monkeypatch.setattr(index, 'get_db_connection', lambda *args: db)
+    client = index.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user'] = 'student@example.com'
+        sess['user_id'] = 'user-1'
+    client.db = db
+    return client
+
+def post_plan(client, pdf_bytes, filename='syllabus.pdf'):
+    data = {
+        'title': 'Finals', 'goal': 'Pass', 'start_date': '2026-01-01', 'end_date': '2026-01-20',
+        'subjects[]': 'OS', 'topics[]': '', 'difficulties[]': '2', 'unit_starts[]': '', 'unit_ends[]': '',
+        'syllabus_pdfs[]': (io.BytesIO(pdf_bytes), filename)
+    }
+    return client.post('/create_plan', data=data, content_type='multipart/form-data')
+
+def flashes(client):
+    with client.session_transaction() as sess:
+        return sess.get('_flashes', [])
+
+def test_open_syllabus_reads_in_memory_and_spooled_streams(make_pdf):
+    pdf = make_pdf(PAGES).getvalue()
+    spooled = tempfile.SpooledTemporaryFile(max_size=10)
+    spooled.write(pdf)
+    for stream in (io.BytesIO(pdf), spooled):
+        with open_syllabus(FileStorage(stream, filename='s.pdf')) as reader:
+            assert len(reader.pages) == 3
+
+def test_open_syllabus_rejects_oversized_file(make_pdf, monkeypatch):
+    monkeypatch.setattr(uploads, 'MAX_PDF_SIZE', 100)
+    with pytest.raises(UploadError, match="larger than"):
+        with open_syllabus(FileStorage(make_pdf(PAGES), filename='big.pdf')):
+            pass
+
+@pytest.mark.parametrize('data, message', [(b'', "is empty"), (b'not a pdf at all', "not a readable PDF")])
+def test_open_syllabus_rejects_empty_and_junk_files(data, message):
+    with pytest.raises(UploadError, match=message):
+        with open_syllabus(FileStorage(io.BytesIO(data), filename='bad.pdf')):
+            pass
+
+def test_extract_stops_at_page_limit(make_pdf):
+    agent = StudyAgent(plan_cache=PlanCache())
+    with open_syllabus(FileStorage(make_pdf(PAGES), filename='s.pdf')) as reader:
+        topics = agent.extract_from_pdf(reader, max_pages=2)
+    names = ' '.join(t['name'] for t in topics)
+    assert "Memory management" in names
+    assert "File systems" not in names
+
+def test_create_plan_with_syllabus_saves_plan(client, make_pdf):
+    res = post_plan(client, make_pdf(PAGES).getvalue())
+    assert res.headers['Location'].endswith('/dashboard')
+    tables = [name for name, _ in client.db.inserts]
+    assert tables == ['study_plans', 'subjects', 'tasks']
+
+def test_bad_syllabus_is_rejected_before_anything_is_saved(client):
+    res = post_plan(client, b'not a pdf at all', filename='junk.pdf')
+    assert res.headers['Location'].endswith('/create_plan')
+    assert client.db.inserts == []
+    assert any("'junk.pdf' is not a readable PDF" in msg for _, msg in flashes(client))
+
+def test_long_syllabus_is_truncated_with_warning(client, make_pdf, monkeypatch):
+    monkeypatch.setattr(index, 'MAX_PDF_PAGES', 1)
+    post_plan(client, make_pdf(PAGES).getvalue())
+    assert ('warning', "'syllabus.pdf' has 3 pages; only the first 1 were read.") in flashes(client)
+    tasks = next(data for name, data in client.db.inserts if name == 'tasks')
+    assert all("Unit 1" in task['description'] for task in tasks)
+
+def test_oversized_form_is_rejected_with_413_handler(client, make_pdf, monkeypatch):
+    monkeypatch.setitem(index.app.config, 'MAX_CONTENT_LENGTH', 200)
+    res = post_plan(client, make_pdf(PAGES).getvalue())
+    assert res.status_code == 302
+    assert res.headers['Location'].endswith('/create_plan')
+    assert client.db.inserts == []
+    assert any("Upload is too large" in msg for _, msg in flashes(client))